@@ -1,76 +1,138 @@
+import httpx
 import pytest
-import sys
-from pathlib import Path
-
-# Add src directory to path so we can import app
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+import pytest_asyncio
 
 from app import app
-from fastapi.testclient import TestClient
 
 
-@pytest.fixture
-def client():
-    """Create a test client for the FastAPI app"""
-    return TestClient(app)
+def pytest_addoption(parser):
+    parser.addoption(
+        "--runslow", action="store_true", default=False, help="run slow tests"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip tests marked as slow unless --runslow is given"""
+    if config.getoption("--runslow"):
+        return
+    skip_slow = pytest.mark.skip(reason="need --runslow option to run")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+
+# Initial activity state as (name, description, schedule, max_participants,
+# participants) rows, built into fresh dicts whenever `activities` is restored
+_ACTIVITY_ROWS = (
+    ("Chess Club",
+     "Learn strategies and compete in chess tournaments",
+     "Fridays, 3:30 PM - 5:00 PM",
+     12,
+     ("michael@mergington.edu", "daniel@mergington.edu")),
+    ("Programming Class",
+     "Learn programming fundamentals and build software projects",
+     "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
+     20,
+     ("emma@mergington.edu", "sophia@mergington.edu")),
+    ("Gym Class",
+     "Physical education and sports activities",
+     "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
+     30,
+     ("john@mergington.edu", "olivia@mergington.edu")),
+    ("Basketball Team",
+     "Competitive basketball training and intramural games",
+     "Tuesdays and Thursdays, 4:00 PM - 5:30 PM",
+     15,
+     ("james@mergington.edu",)),
+    ("Tennis Club",
+     "Tennis lessons and friendly matches",
+     "Mondays and Wednesdays, 3:30 PM - 5:00 PM",
+     10,
+     ("alex@mergington.edu",)),
+    ("Drama Club",
+     "Theater performances and acting workshops",
+     "Wednesdays and Fridays, 4:00 PM - 5:30 PM",
+     25,
+     ("isabella@mergington.edu", "noah@mergington.edu")),
+    ("Art Studio",
+     "Painting, drawing, and sculpture classes",
+     "Tuesdays, 3:30 PM - 5:00 PM",
+     18,
+     ("ava@mergington.edu",)),
+)
+_ACTIVITY_NAMES = frozenset(row[0] for row in _ACTIVITY_ROWS)
+
+
+def _build_initial_state():
+    """Build a fresh copy of the initial activities state"""
+    return {
+        name: {
+            "description": description,
+            "schedule": schedule,
+            "max_participants": max_participants,
+            "participants": list(participants),
+        }
+        for name, description, schedule, max_participants, participants in _ACTIVITY_ROWS
+    }
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def client():
+    """Create an async test client for the FastAPI app, shared across the session"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as c:
+        yield c
+
+
+@pytest.fixture(scope="session")
+def sync_client():
+    """Create a synchronous test client for benchmarks, which time plain calls"""
+    from fastapi.testclient import TestClient
+    
+    with TestClient(app) as c:
+        yield c
+
+
+def _restore_activities(activities):
+    """Restore activities in place from the initial state rows
+
+    The dict is mutated rather than rebound because the tests hold a
+    reference to it via ``from app import activities``. The endpoints never
+    add or remove activities, so overwriting each entry is enough and the
+    dict only needs clearing if its key set has drifted.
+    """
+    if activities.keys() != _ACTIVITY_NAMES:
+        activities.clear()
+    activities.update(_build_initial_state())
+
+
+@pytest.fixture(scope="session")
+def read_only_activities():
+    """Restore activities once for tests that never mutate them"""
+    from app import activities
+    
+    _restore_activities(activities)
+    return activities
 
 
 @pytest.fixture
 def reset_activities():
-    """Reset activities to initial state before each test"""
+    """Reset activities to initial state before each mutating test"""
     from app import activities
     
-    initial_state = {
-        "Chess Club": {
-            "description": "Learn strategies and compete in chess tournaments",
-            "schedule": "Fridays, 3:30 PM - 5:00 PM",
-            "max_participants": 12,
-            "participants": ["michael@mergington.edu", "daniel@mergington.edu"]
-        },
-        "Programming Class": {
-            "description": "Learn programming fundamentals and build software projects",
-            "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
-            "max_participants": 20,
-            "participants": ["emma@mergington.edu", "sophia@mergington.edu"]
-        },
-        "Gym Class": {
-            "description": "Physical education and sports activities",
-            "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
-            "max_participants": 30,
-            "participants": ["john@mergington.edu", "olivia@mergington.edu"]
-        },
-        "Basketball Team": {
-            "description": "Competitive basketball training and intramural games",
-            "schedule": "Tuesdays and Thursdays, 4:00 PM - 5:30 PM",
-            "max_participants": 15,
-            "participants": ["james@mergington.edu"]
-        },
-        "Tennis Club": {
-            "description": "Tennis lessons and friendly matches",
-            "schedule": "Mondays and Wednesdays, 3:30 PM - 5:00 PM",
-            "max_participants": 10,
-            "participants": ["alex@mergington.edu"]
-        },
-        "Drama Club": {
-            "description": "Theater performances and acting workshops",
-            "schedule": "Wednesdays and Fridays, 4:00 PM - 5:30 PM",
-            "max_participants": 25,
-            "participants": ["isabella@mergington.edu", "noah@mergington.edu"]
-        },
-        "Art Studio": {
-            "description": "Painting, drawing, and sculpture classes",
-            "schedule": "Tuesdays, 3:30 PM - 5:00 PM",
-            "max_participants": 18,
-            "participants": ["ava@mergington.edu"]
-        }
-    }
-    
-    # Clear and reset activities
-    activities.clear()
-    activities.update(initial_state)
+    _restore_activities(activities)
     
     yield
     
     # Reset after test
-    activities.clear()
-    activities.update(initial_state)
+    _restore_activities(activities)
+
+
+@pytest.fixture
+def tennis_prepopulated(reset_activities):
+    """Sign extra students up for Tennis Club directly, without HTTP requests"""
+    from app import activities
+    
+    emails = ["student1@mergington.edu", "student2@mergington.edu"]
+    activities["Tennis Club"]["participants"].extend(emails)
+    return emails